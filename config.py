@@ -16,6 +16,8 @@ YAD2_PARAMS = {
     "imgOnly": "1",
     "ownerID": "1",
 }
+# Bumped whenever YAD2_PARAMS is mutated so cached search URLs are rebuilt.
+YAD2_PARAMS_VERSION = 0
 
 CHECK_INTERVAL_SECONDS = 20
 
@@ -28,7 +30,7 @@ NOTIFY_EMAIL = os.getenv("NOTIFY_EMAIL", "")
 TELEGRAM_BOT_TOKEN = os.getenv("TELEGRAM_BOT_TOKEN", "")
 TELEGRAM_CHAT_ID = os.getenv("TELEGRAM_CHAT_ID", "")
 
-FOUND_FILE = "found_listings.json"
+FOUND_FILE = "found_listings.jsonl"
 PROFILES_FILE = "profiles.json"
 LOG_FILE = "monitor.log"
 LOG_MAX_BYTES = 5 * 1024 * 1024  # 5 MB
@@ -37,14 +39,23 @@ LOG_BACKUP_COUNT = 3
 SEEN_TTL_DAYS = 30
 
 MAX_PAGES = 5
-PAGE_DELAY_SECONDS = 3
+PAGE_FETCH_WORKERS = MAX_PAGES - 1  # all extra pages in flight at once
+PAGE_JITTER_SECONDS = (0.5, 1.5)  # random pre-request delay per extra page
 
 FETCH_MAX_RETRIES = 3
 FETCH_RETRY_DELAY = 5
 
+# Idle gaps longer than this likely outlive the server's keep-alive, so the
+# connection is re-warmed with a HEAD request this many seconds before the fetch.
+KEEPALIVE_IDLE_SECONDS = 60
+SESSION_WARMUP_LEAD_SECONDS = 5
+
 CAPTCHA_BACKOFF_MULTIPLIER = 2
 CAPTCHA_BACKOFF_MAX = 3600  # 1 hour cap
 
+# Honour HTTP(S)_PROXY / .netrc for Yad2 requests (off by default).
+HTTP_TRUST_ENV = os.getenv("HTTP_TRUST_ENV", "0") == "1"
+
 REQUEST_HEADERS = {
     "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,image/avif,image/webp,image/apng,*/*;q=0.8,application/signed-exchange;v=b3;q=0.7",
     "Accept-Language": "he-IL,he;q=0.9,en-US;q=0.8,en;q=0.7",
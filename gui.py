@@ -1,20 +1,34 @@
 #!/usr/bin/env python3
 """Flask GUI for the Yad2 vehicle monitor."""
 
-import collections
 import csv
 import io
-import json
+import os
 import threading
 from pathlib import Path
 
 import requests as http_requests
 from flask import Flask, Response, jsonify, render_template, request
+from flask.json.provider import DefaultJSONProvider
 
 import config
 import monitor
 
+
+class _FastJSONProvider(DefaultJSONProvider):
+    """Routes jsonify / request.get_json through monitor's orjson-backed helpers."""
+
+    def dumps(self, obj, **kwargs) -> str:
+        # Keep Flask's default of sorted keys (the profile dropdown relies on it).
+        sort_keys = kwargs.get("sort_keys", self.sort_keys)
+        return monitor.json_dumps(obj, sort_keys=sort_keys).decode("utf-8")
+
+    def loads(self, s, **kwargs):
+        return monitor.json_loads(s)
+
+
 app = Flask(__name__)
+app.json = _FastJSONProvider(app)
 
 BASE_DIR = Path(__file__).parent
 LOG_PATH = BASE_DIR / config.LOG_FILE
@@ -22,6 +36,9 @@ PROFILES_PATH = BASE_DIR / config.PROFILES_FILE
 
 _monitor_thread: threading.Thread | None = None
 _monitor_lock = threading.Lock()
+# Serializes profile saves: they share one temp path, and waitress runs routes
+# on several threads.
+_profiles_lock = threading.Lock()
 
 BOOLEAN_PARAMS = {"priceOnly", "imgOnly", "ownerID"}
 RANGE_PARAMS = {"year", "price", "km", "hand"}
@@ -47,15 +64,32 @@ def _load_profiles() -> dict:
     if not PROFILES_PATH.exists():
         return {}
     try:
-        return json.loads(PROFILES_PATH.read_text(encoding="utf-8"))
-    except (json.JSONDecodeError, OSError):
+        return monitor.json_loads(PROFILES_PATH.read_bytes())
+    except (ValueError, OSError):
         return {}
 
 
+def _tail(path: Path, n: int = 80, block: int = 64 * 1024) -> list[str]:
+    """Last n lines of path, reading backwards from the end in growing blocks."""
+    with path.open("rb") as f:
+        size = f.seek(0, 2)
+        while True:
+            read = min(size, block)
+            f.seek(size - read)
+            lines = f.read(read).splitlines()
+            # The first line may be partial unless we read from the start.
+            if read == size or len(lines) > n:
+                break
+            block *= 2
+    return [line.decode("utf-8", errors="replace") for line in lines[-n:]]
+
+
 def _save_profiles(profiles: dict) -> None:
-    PROFILES_PATH.write_text(
-        json.dumps(profiles, ensure_ascii=False, indent=2), encoding="utf-8"
-    )
+    payload = monitor.json_dumps(profiles)
+    tmp_path = PROFILES_PATH.with_suffix(".tmp")
+    with _profiles_lock:
+        tmp_path.write_bytes(payload)
+        os.replace(tmp_path, PROFILES_PATH)
 
 
 # ---------------------------------------------------------------------------
@@ -88,7 +122,7 @@ def yad2_options():
 
     try:
         resp = http_requests.get(YAD2_OPTIONS_URL, params=params, timeout=10)
-        data = resp.json().get("data", {})
+        data = monitor.json_loads(resp.content).get("data", {})
         return jsonify(data)
     except Exception:
         return jsonify({field: []}), 502
@@ -112,6 +146,7 @@ def set_params():
     new_params = data.get("params", {})
     for key, value in new_params.items():
         config.YAD2_PARAMS[key] = str(value)
+    config.YAD2_PARAMS_VERSION += 1
 
     if "checkInterval" in data:
         try:
@@ -178,22 +213,30 @@ def clear_listings():
     return jsonify({"ok": True})
 
 
-@app.get("/api/listings/export")
-def export_listings():
-    items = monitor.get_found_listings()
-    if not items:
-        return Response("No data", status=204)
+EXPORT_FIELDS = ["token", "manufacturer", "model", "sub_model", "price", "year", "km", "hand", "area", "link", "found_at"]
+
 
-    fields = ["token", "manufacturer", "model", "sub_model", "price", "year", "km", "hand", "area", "link", "found_at"]
+def _csv_rows(items: list[dict]):
+    """Yields the CSV one row at a time through a reusable line buffer."""
     buf = io.StringIO()
-    writer = csv.DictWriter(buf, fieldnames=fields, extrasaction="ignore")
+    writer = csv.DictWriter(buf, fieldnames=EXPORT_FIELDS, extrasaction="ignore")
     writer.writeheader()
+    yield buf.getvalue()
     for item in items:
+        buf.seek(0)
+        buf.truncate()
         writer.writerow(item)
+        yield buf.getvalue()
+
+
+@app.get("/api/listings/export")
+def export_listings():
+    items = monitor.get_found_listings()
+    if not items:
+        return Response("No data", status=204)
 
-    output = buf.getvalue()
     return Response(
-        output,
+        _csv_rows(items),
         mimetype="text/csv",
         headers={"Content-Disposition": "attachment; filename=listings.csv"},
     )
@@ -209,11 +252,7 @@ def get_logs():
         return jsonify({"lines": []})
 
     try:
-        tail = collections.deque(
-            LOG_PATH.read_text(encoding="utf-8", errors="replace").splitlines(),
-            maxlen=80,
-        )
-        return jsonify({"lines": list(tail)})
+        return jsonify({"lines": _tail(LOG_PATH, 80)})
     except OSError:
         return jsonify({"lines": []})
 
@@ -246,11 +285,13 @@ def save_profile():
         return jsonify({"error": "empty name"}), 400
 
     profiles = _load_profiles()
-    profiles[name] = {
+    profile = {
         "params": dict(config.YAD2_PARAMS),
         "checkInterval": config.CHECK_INTERVAL_SECONDS,
     }
-    _save_profiles(profiles)
+    if profiles.get(name) != profile:
+        profiles[name] = profile
+        _save_profiles(profiles)
     return jsonify({"ok": True})
 
 
@@ -261,6 +302,7 @@ def load_profile(name):
         return jsonify({"error": "profile not found"}), 404
     profile = profiles[name]
     config.YAD2_PARAMS.update(profile.get("params", {}))
+    config.YAD2_PARAMS_VERSION += 1
     if "checkInterval" in profile:
         config.CHECK_INTERVAL_SECONDS = max(5, int(profile["checkInterval"]))
     return jsonify({"ok": True})
@@ -277,4 +319,9 @@ def delete_profile(name):
 
 
 if __name__ == "__main__":
-    app.run(debug=False, host="127.0.0.1", port=5001)
+    try:
+        from waitress import serve
+    except ImportError:
+        app.run(host="127.0.0.1", port=5001, threaded=True)
+    else:
+        serve(app, host="127.0.0.1", port=5001, threads=8)
@@ -3,63 +3,203 @@
 Yad2 vehicle monitor - sends email alerts when new private listings appear.
 """
 
+import functools
 import json
 import logging
+import os
+import random
+import re
 import signal
 import smtplib
 import sys
 import threading
 import time
+from collections.abc import Container
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime, timedelta, timezone
-from email.mime.multipart import MIMEMultipart
-from email.mime.text import MIMEText
+from email.message import EmailMessage
+from html import escape
+from html.parser import HTMLParser
 from logging.handlers import RotatingFileHandler
 from pathlib import Path
+from urllib.parse import urlencode
 
 import requests
-from bs4 import BeautifulSoup
 from fake_useragent import UserAgent
+from requests.adapters import HTTPAdapter
 
 import config
 
+try:
+    import orjson
+except ImportError:  # stdlib fallback
+    orjson = None
+
+try:
+    from selectolax.parser import HTMLParser as SelectolaxParser
+except ImportError:  # stdlib html.parser fallback
+    SelectolaxParser = None
+
 BASE_DIR = Path(__file__).parent
 LOG_PATH = BASE_DIR / config.LOG_FILE
 FOUND_PATH = BASE_DIR / config.FOUND_FILE
 
 shutdown_event = threading.Event()
 
+
+# ---------------------------------------------------------------------------
+# JSON helpers (orjson when available, stdlib json otherwise)
+# ---------------------------------------------------------------------------
+
+if orjson is not None:
+    def json_loads(data: str | bytes):
+        return orjson.loads(data)
+
+    def json_dumps(obj, sort_keys: bool = False) -> bytes:
+        option = orjson.OPT_NON_STR_KEYS | (orjson.OPT_SORT_KEYS if sort_keys else 0)
+        return orjson.dumps(obj, option=option)
+else:
+    def json_loads(data: str | bytes):
+        return json.loads(data)
+
+    def json_dumps(obj, sort_keys: bool = False) -> bytes:
+        return json.dumps(
+            obj, ensure_ascii=False, separators=(",", ":"), sort_keys=sort_keys
+        ).encode("utf-8")
+
 # ---------------------------------------------------------------------------
 # Found listings persistence (Phase 1a)
 # ---------------------------------------------------------------------------
 
 _found_listings: list[dict] = []
+_FOUND_AT_FORMAT = "%Y-%m-%d %H:%M:%S"  # local time; sorts chronologically
+_found_by_token: dict[str, dict] = {}  # token -> entry in _found_listings, incl. dismissed
 _found_lock = threading.Lock()
 _FOUND_MAX = 500
 
+# FOUND_PATH is an append-only JSONL log: one listing per line, plus
+# {"dismiss": token} tombstones. Lines that no longer describe a live entry
+# (tombstones, entries trimmed by _FOUND_MAX) are garbage; the file is
+# rewritten once they exceed _FOUND_COMPACT_RATIO of all lines.
+_found_log_lines = 0
+_FOUND_COMPACT_RATIO = 0.3
+_LEGACY_FOUND_PATH = BASE_DIR / "found_listings.json"
+
 
 def _load_found() -> None:
-    global _found_listings
+    global _found_listings, _found_log_lines
     if not FOUND_PATH.exists():
+        _load_legacy_found()
         return
+
+    entries: dict[str, dict] = {}
+    lines = 0
     try:
-        data = json.loads(FOUND_PATH.read_text(encoding="utf-8"))
-        if isinstance(data, list):
-            _found_listings = data[-_FOUND_MAX:]
-    except (json.JSONDecodeError, TypeError, OSError):
-        pass
+        with FOUND_PATH.open("rb") as f:
+            for raw in f:
+                if not raw.strip():
+                    continue
+                lines += 1
+                try:
+                    record = json_loads(raw)
+                except (ValueError, TypeError):
+                    continue  # torn write from an interrupted append
+                if not isinstance(record, dict):
+                    continue
+                if "dismiss" in record:
+                    entry = entries.get(record["dismiss"])
+                    if entry is not None:
+                        entry["dismissed"] = True
+                elif record.get("token"):
+                    entries.pop(record["token"], None)
+                    entries[record["token"]] = record
+    except OSError:
+        return
 
+    _found_listings = list(entries.values())[-_FOUND_MAX:]
+    _found_log_lines = lines
+    _rebuild_token_index()
 
-def _save_found() -> None:
+
+def _load_legacy_found() -> None:
+    """One-time migration from the old single-document found_listings.json."""
+    global _found_listings
+    if not _LEGACY_FOUND_PATH.exists():
+        return
     try:
-        FOUND_PATH.write_text(
-            json.dumps(_found_listings, ensure_ascii=False, indent=2),
-            encoding="utf-8",
-        )
+        data = json_loads(_LEGACY_FOUND_PATH.read_bytes())
+    except (ValueError, TypeError, OSError):
+        return
+    if isinstance(data, list):
+        _found_listings = data[-_FOUND_MAX:]
+        _rebuild_token_index()
+        _save_found()
+
+
+def _rebuild_token_index() -> None:
+    _found_by_token.clear()
+    _found_by_token.update((l["token"], l) for l in _found_listings)
+
+
+def _encode_records(records: list[dict]) -> bytes:
+    return b"".join(json_dumps(record) + b"\n" for record in records)
+
+
+# Writes are planned (serialized, bookkeeping updated) under _found_lock, then
+# performed under _found_io_lock only. _found_io_lock is taken before
+# _found_lock is released, so writes hit the file in mutation order and
+# readers such as get_found_listings don't wait for a single in-flight write.
+# A second mutator that arrives mid-write does block on _found_io_lock while
+# holding _found_lock, so readers then wait until the first write finishes.
+_found_io_lock = threading.Lock()
+
+
+def _plan_rewrite() -> tuple[bytes, bool]:
+    """Full rewrite with only the live entries (compaction). Hold _found_lock."""
+    global _found_log_lines
+    _found_log_lines = len(_found_listings)
+    return _encode_records(_found_listings), False
+
+
+def _plan_append(records: list[dict]) -> tuple[bytes, bool]:
+    """Append records, or compact instead once garbage is due. Hold _found_lock."""
+    global _found_log_lines
+    _found_log_lines += len(records)
+    garbage = _found_log_lines - len(_found_listings)
+    if garbage > _FOUND_COMPACT_RATIO * _found_log_lines:
+        return _plan_rewrite()
+    return _encode_records(records), True
+
+
+def _write_found(payload: bytes, append: bool) -> None:
+    try:
+        if append:
+            with FOUND_PATH.open("ab") as f:
+                f.write(payload)
+        else:
+            tmp_path = FOUND_PATH.with_suffix(".tmp")
+            tmp_path.write_bytes(payload)
+            os.replace(tmp_path, FOUND_PATH)
     except OSError:
         pass
 
 
+def _flush_found(write: tuple[bytes, bool]) -> None:
+    """Perform a planned write and release the _found_io_lock acquired for it."""
+    try:
+        _write_found(*write)
+    finally:
+        _found_io_lock.release()
+
+
+def _save_found() -> None:
+    """Unlocked compaction; only used while loading at import time."""
+    _write_found(*_plan_rewrite())
+
+
 _load_found()
+if _found_log_lines != len(_found_listings):
+    _save_found()
 
 
 def get_found_listings() -> list[dict]:
@@ -68,35 +208,42 @@ def get_found_listings() -> list[dict]:
         return [l for l in _found_listings if not l.get("dismissed")]
 
 
-def _get_seen_tokens() -> set[str]:
-    """All tokens (including dismissed) for dedup tracking."""
-    with _found_lock:
-        return {l["token"] for l in _found_listings}
-
-
 def _append_found(listings: list[dict]) -> None:
     with _found_lock:
+        _found_by_token.update((l["token"], l) for l in listings)
         _found_listings.extend(listings)
-        if len(_found_listings) > _FOUND_MAX:
-            del _found_listings[: len(_found_listings) - _FOUND_MAX]
-        _save_found()
+        overflow = len(_found_listings) - _FOUND_MAX
+        if overflow > 0:
+            for l in _found_listings[:overflow]:
+                _found_by_token.pop(l["token"], None)
+            del _found_listings[:overflow]
+        write = _plan_append(listings)
+        _found_io_lock.acquire()
+    _flush_found(write)
 
 
 def remove_found(token: str) -> bool:
     """Mark a listing as dismissed (hidden from UI but still tracked)."""
     with _found_lock:
-        for entry in _found_listings:
-            if entry.get("token") == token and not entry.get("dismissed"):
-                entry["dismissed"] = True
-                _save_found()
-                return True
-        return False
+        entry = _found_by_token.get(token)
+        if entry is None or entry.get("dismissed"):
+            return False
+        entry["dismissed"] = True
+        write = _plan_append([{"dismiss": token}])
+        _found_io_lock.acquire()
+    _flush_found(write)
+    return True
 
 
 def clear_found() -> None:
     with _found_lock:
+        if not _found_listings and _found_log_lines == 0:
+            return  # already empty on disk; nothing to rewrite
         _found_listings.clear()
-        _save_found()
+        _found_by_token.clear()
+        write = _plan_rewrite()
+        _found_io_lock.acquire()
+    _flush_found(write)
 
 
 # ---------------------------------------------------------------------------
@@ -124,6 +271,12 @@ def _update_state(**kwargs) -> None:
         _state.update(kwargs)
 
 
+def _increment_state(**deltas: int) -> None:
+    with _state_lock:
+        for key, delta in deltas.items():
+            _state[key] = _state.get(key, 0) + delta
+
+
 def _reset_state() -> None:
     with _state_lock:
         _state.update(
@@ -174,96 +327,237 @@ ua = UserAgent(platforms="pc")
 # ---------------------------------------------------------------------------
 
 def create_session() -> requests.Session:
+    # Accept-Encoding is left to requests/urllib3: it advertises gzip/deflate,
+    # plus br when a brotli codec is installed, and decodes transparently.
     session = requests.Session()
+    # Without this, every request re-reads proxy env vars and ~/.netrc.
+    session.trust_env = config.HTTP_TRUST_ENV
     session.headers.update(config.REQUEST_HEADERS)
     session.cookies.update(config.REQUEST_COOKIES)
+    # One pooled keep-alive connection per concurrent page fetch. Retries stay
+    # in fetch_page so the delay between attempts can be cut short by shutdown.
+    adapter = HTTPAdapter(pool_connections=4, pool_maxsize=config.PAGE_FETCH_WORKERS + 1)
+    session.mount("https://", adapter)
+    _refresh_ua_pool()
     _rotate_ua(session)
     return session
 
 
+def _warm_session(session: requests.Session) -> None:
+    """Opens (or refreshes) the pooled keep-alive connection with a cheap HEAD."""
+    try:
+        session.head(config.YAD2_URL, timeout=10)
+    except requests.RequestException:
+        pass
+
+
+def _idle(session: requests.Session, seconds: float) -> None:
+    """Waits until the next fetch, re-warming the connection before long gaps end."""
+    lead = config.SESSION_WARMUP_LEAD_SECONDS
+    if seconds <= config.KEEPALIVE_IDLE_SECONDS:
+        shutdown_event.wait(seconds)
+        return
+    if not shutdown_event.wait(seconds - lead):
+        _warm_session(session)
+        shutdown_event.wait(lead)
+
+
+@functools.lru_cache(maxsize=256)
+def _sec_ch_ua_for(agent: str) -> str:
+    if "Chrome/" not in agent:
+        return ""
+    ver = agent.split("Chrome/")[1].split(" ")[0].split(".")[0]
+    return f'"Chromium";v="{ver}", "Not_A Brand";v="24"'
+
+
+# Distinct (User-Agent, sec-ch-ua) pairs, resampled for every new session.
+_UA_POOL_SIZE = 64
+_UA_POOL: list[tuple[str, str]] = []
+
+
+def _refresh_ua_pool() -> None:
+    global _UA_POOL
+    agents = dict.fromkeys(ua.random for _ in range(_UA_POOL_SIZE))
+    _UA_POOL = [(agent, _sec_ch_ua_for(agent)) for agent in agents]
+
+
 def _rotate_ua(session: requests.Session) -> None:
-    agent = ua.random
+    agent, sec_ch_ua = random.choice(_UA_POOL)
     session.headers["User-Agent"] = agent
-    chrome_match = ""
-    if "Chrome/" in agent:
-        ver = agent.split("Chrome/")[1].split(" ")[0].split(".")[0]
-        chrome_match = f'"Chromium";v="{ver}", "Not_A Brand";v="24"'
-    session.headers["sec-ch-ua"] = chrome_match
+    session.headers["sec-ch-ua"] = sec_ch_ua
 
 
 # ---------------------------------------------------------------------------
 # Fetch listings from Yad2
 # ---------------------------------------------------------------------------
 
-def build_url(page: int = 1) -> str:
-    params = "&".join(f"{k}={v}" for k, v in config.YAD2_PARAMS.items())
-    url = f"{config.YAD2_URL}?{params}"
-    if page > 1:
-        url += f"&page={page}"
-    return url
+# Search URLs for pages 1..MAX_PAGES, rebuilt only when YAD2_PARAMS changes.
+_cached_page_urls: tuple[str, ...] = ()
+_cached_params_version = -1  # forces a build on first call
 
 
-def fetch_page(session: requests.Session, url: str) -> str | None:
+def build_url(page: int = 1) -> str:
+    global _cached_page_urls, _cached_params_version
+    # Read the version before building: a params change racing the build then
+    # leaves a mismatch, so the next call rebuilds instead of keeping stale URLs.
+    version = config.YAD2_PARAMS_VERSION
+    urls = _cached_page_urls
+    if _cached_params_version != version:
+        base = f"{config.YAD2_URL}?{urlencode(config.YAD2_PARAMS)}"
+        urls = (base,) + tuple(f"{base}&page={p}" for p in range(2, config.MAX_PAGES + 1))
+        _cached_page_urls = urls
+        _cached_params_version = version
+    if page <= 1:
+        return urls[0]
+    if page <= len(urls):
+        return urls[page - 1]
+    return f"{urls[0]}&page={page}"
+
+
+_RETRY_STATUSES = frozenset((429, 500, 502, 503, 504))
+
+
+def fetch_page(session: requests.Session, url: str) -> bytes | None:
+    """Up to FETCH_MAX_RETRIES attempts, FETCH_RETRY_DELAY seconds apart.
+
+    Connection errors, timeouts and 429/5xx are retried; any other HTTP error
+    status fails immediately.
+    """
     for attempt in range(1, config.FETCH_MAX_RETRIES + 1):
         try:
             resp = session.get(url, timeout=30)
             resp.raise_for_status()
-            return resp.text
+            return resp.content  # raw bytes: parse_listings never needs decoded text
+        except requests.HTTPError as exc:
+            if exc.response.status_code not in _RETRY_STATUSES:
+                log.error("Fetch failed for %s: %s", url, exc)
+                return None
+            log.warning("Fetch attempt %d/%d failed: %s", attempt, config.FETCH_MAX_RETRIES, exc)
         except requests.RequestException as exc:
             log.warning("Fetch attempt %d/%d failed: %s", attempt, config.FETCH_MAX_RETRIES, exc)
-            if attempt < config.FETCH_MAX_RETRIES:
-                time.sleep(config.FETCH_RETRY_DELAY)
+        if attempt < config.FETCH_MAX_RETRIES and shutdown_event.wait(config.FETCH_RETRY_DELAY):
+            return None
     log.error("All %d fetch attempts failed for %s", config.FETCH_MAX_RETRIES, url)
     return None
 
 
+# Shared read-only default for nested lookups; avoids a fresh {} per .get().
+_EMPTY: dict = {}
+
+
 def _is_private_seller(item: dict) -> bool:
-    customer = item.get("customer", {})
-    return "agencyName" not in customer
+    return "agencyName" not in (item.get("customer") or _EMPTY)
+
+
+_LISTING_TIERS = ("private", "commercial", "solo", "platinum", "boost")
 
 
 class CaptchaDetected(Exception):
     pass
 
 
-def parse_listings(html: str) -> tuple[list[dict], int]:
+_NEXT_DATA_RE = re.compile(rb'<script[^>]+id="__NEXT_DATA__"[^>]*>(.*?)</script>', re.DOTALL)
+
+
+def _load_listings_data(payload: bytes) -> dict:
+    """Returns dehydratedState.queries[0].state.data from the __NEXT_DATA__ blob."""
+    data = json_loads(payload)
+    return data["props"]["pageProps"]["dehydratedState"]["queries"][0]["state"]["data"]
+
+
+class _NextDataFound(Exception):
+    pass
+
+
+class _NextDataParser(HTMLParser):
+    """Collects the __NEXT_DATA__ script body and aborts the parse once it closes."""
+
+    def __init__(self) -> None:
+        super().__init__(convert_charrefs=False)
+        self._in_target = False
+        self._chunks: list[str] = []
+
+    def handle_starttag(self, tag, attrs):
+        if tag == "script" and ("id", "__NEXT_DATA__") in attrs:
+            self._in_target = True
+
+    def handle_data(self, data):
+        if self._in_target:
+            self._chunks.append(data)
+
+    def handle_endtag(self, tag):
+        if self._in_target and tag == "script":
+            raise _NextDataFound("".join(self._chunks))
+
+
+def _find_next_data(html: bytes) -> bytes | None:
+    match = _NEXT_DATA_RE.search(html)
+    if match is not None:
+        return match.group(1)
+    # Slow path for markup the regex does not expect (quoting, attribute order).
+    # Narrow it in bytes first: pages without the marker at all (e.g. CAPTCHA
+    # blocks) skip parsing, and the rest is parsed from the enclosing <script>.
+    marker = html.find(b"__NEXT_DATA__")
+    if marker == -1:
+        return None
+    start = html.rfind(b"<script", 0, marker)
+    if start != -1:
+        html = html[start:]
+    if SelectolaxParser is not None:
+        node = SelectolaxParser(html).css_first("script#__NEXT_DATA__")
+        return node.text().encode() if node is not None else None
+    try:
+        _NextDataParser().feed(html.decode("utf-8", errors="replace"))
+    except _NextDataFound as found:
+        return found.args[0].encode()
+    return None
+
+
+def parse_listings(html: bytes) -> tuple[list[dict], int]:
     """Returns (private_listings, total_pages). Raises CaptchaDetected on bot block."""
-    soup = BeautifulSoup(html, "html.parser")
-    script = soup.find("script", id="__NEXT_DATA__")
-    if script is None:
-        if "ShieldSquare" in html or "Captcha" in html:
+    next_data = _find_next_data(html)
+    if next_data is None:
+        if b"ShieldSquare" in html or b"Captcha" in html:
             raise CaptchaDetected("CAPTCHA detected in response")
         log.warning("__NEXT_DATA__ script tag not found in page")
         return [], 0
 
+    # ValueError covers JSONDecodeError and the UnicodeDecodeError stdlib json
+    # raises on raw page bytes that are not valid UTF-8.
     try:
-        data = json.loads(script.string)
-        listings_data = (
-            data["props"]["pageProps"]["dehydratedState"]["queries"][0]["state"]["data"]
-        )
-    except (json.JSONDecodeError, KeyError, IndexError) as exc:
+        listings_data = _load_listings_data(next_data)
+    except (ValueError, KeyError, IndexError) as exc:
         log.error("Failed to parse JSON data: %s", exc)
         return [], 0
 
-    total_pages = listings_data.get("pagination", {}).get("pages", 1)
+    total_pages = (listings_data.get("pagination") or _EMPTY).get("pages", 1)
 
-    all_listings: list[dict] = []
-    for tier in ("private", "commercial", "solo", "platinum", "boost"):
-        all_listings.extend(listings_data.get(tier, []))
-
-    private_listings = [item for item in all_listings if _is_private_seller(item)]
+    private_listings = [
+        item
+        for tier in _LISTING_TIERS
+        for item in listings_data.get(tier) or ()
+        if _is_private_seller(item)
+    ]
     return private_listings, total_pages
 
 
+def _text(value) -> str:
+    """The "text" of a Yad2 {id, text} field; plain values are stringified."""
+    if isinstance(value, dict):
+        return value.get("text", "")
+    return "" if value is None else str(value)
+
+
 def extract_listing_info(item: dict) -> dict:
-    year = item.get("vehicleDates", {}).get("yearOfProduction", "")
+    year = (item.get("vehicleDates") or _EMPTY).get("yearOfProduction", "")
 
-    address = item.get("address", {})
-    area_obj = address.get("city", address.get("area", {}))
-    area = area_obj.get("text", "") if isinstance(area_obj, dict) else str(area_obj)
+    address = item.get("address") or _EMPTY
+    area_obj = address.get("city")
+    if area_obj is None:
+        area_obj = address.get("area")
+    area = _text(area_obj)
 
-    hand_obj = item.get("hand", {})
-    hand = hand_obj.get("text", "") if isinstance(hand_obj, dict) else str(hand_obj)
+    hand = _text(item.get("hand"))
 
     km = item.get("km")
 
@@ -275,15 +569,15 @@ def extract_listing_info(item: dict) -> dict:
     if isinstance(images, list) and images:
         first = images[0]
         if isinstance(first, dict):
-            img = first.get("src", first.get("url", ""))
+            img = first.get("src") or first.get("url", "")
         elif isinstance(first, str):
             img = first
 
     return {
         "token": token,
-        "model": item.get("model", {}).get("text", ""),
-        "sub_model": item.get("subModel", {}).get("text", ""),
-        "manufacturer": item.get("manufacturer", {}).get("text", ""),
+        "model": _text(item.get("model")),
+        "sub_model": _text(item.get("subModel")),
+        "manufacturer": _text(item.get("manufacturer")),
         "price": item.get("price", ""),
         "year": year,
         "km": km,
@@ -294,10 +588,36 @@ def extract_listing_info(item: dict) -> dict:
     }
 
 
-def fetch_listings(session: requests.Session) -> list[dict] | None:
-    """Fetches all pages. Returns None on CAPTCHA (caller handles backoff)."""
+def _fetch_extra_page(session: requests.Session, page: int, pages_to_fetch: int) -> list[dict]:
+    """Fetches and parses one of pages 2..N (raw items). Runs on a worker thread."""
+    if shutdown_event.wait(random.uniform(*config.PAGE_JITTER_SECONDS)):
+        return []
+    url = build_url(page=page)
+    log.info("Fetching page %d/%d: %s", page, pages_to_fetch, url)
+    html = fetch_page(session, url)
+    if html is None:
+        return []
+    raw_listings, _ = parse_listings(html)  # may raise CaptchaDetected
+    return raw_listings
+
+
+def _extract_page(
+    raw_listings: list[dict], known: Container[str], skip_tokens: Container[str]
+) -> dict[str, dict | None]:
+    """token -> listing info for one page; tokens in known are left out, skip_tokens map to None."""
+    page: dict[str, dict | None] = {}
+    for item in raw_listings:
+        token = item.get("token", "")
+        if token and token not in page and token not in known:
+            page[token] = None if token in skip_tokens else extract_listing_info(item)
+    return page
+
+
+def fetch_listings(
+    session: requests.Session, skip_tokens: Container[str] = frozenset()
+) -> list[dict] | None:
+    """Fetches all pages; listings in skip_tokens are dropped before extraction."""
     _rotate_ua(session)
-    all_results: list[dict] = []
 
     url = build_url(page=1)
     log.info("Fetching listings from: %s", url)
@@ -307,35 +627,41 @@ def fetch_listings(session: requests.Session) -> list[dict] | None:
         return []
 
     raw_listings, total_pages = parse_listings(html)  # may raise CaptchaDetected
-    all_results.extend(extract_listing_info(item) for item in raw_listings)
+    all_results = _extract_page(raw_listings, (), skip_tokens)
 
     pages_to_fetch = min(total_pages, config.MAX_PAGES)
-    for page in range(2, pages_to_fetch + 1):
-        if shutdown_event.is_set():
-            break
-        time.sleep(config.PAGE_DELAY_SECONDS)
-        url = build_url(page=page)
-        log.info("Fetching page %d/%d: %s", page, pages_to_fetch, url)
-        html = fetch_page(session, url)
-        if html is None:
-            break
-        raw_listings, _ = parse_listings(html)
-        all_results.extend(extract_listing_info(item) for item in raw_listings)
-
-    seen_tokens = set()
-    unique: list[dict] = []
-    for item in all_results:
-        if item["token"] not in seen_tokens:
-            seen_tokens.add(item["token"])
-            unique.append(item)
-
-    log.info("Found %d private listings across %d page(s)", len(unique), pages_to_fetch)
-    return unique
+    if pages_to_fetch > 1:
+        # Workers fetch + parse; each page is extracted here as soon as it
+        # lands, overlapping with the fetches still in flight. Duplicates
+        # between extra pages are resolved in page order at merge time, so the
+        # lowest page wins regardless of completion order.
+        by_page: dict[int, dict[str, dict | None]] = {}
+        workers = min(pages_to_fetch - 1, config.PAGE_FETCH_WORKERS)
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="yad2-page") as pool:
+            futures = {
+                pool.submit(_fetch_extra_page, session, page, pages_to_fetch): page
+                for page in range(2, pages_to_fetch + 1)
+            }
+            for future in as_completed(futures):
+                if shutdown_event.is_set():
+                    for pending in futures:
+                        pending.cancel()
+                    break
+                # re-raises CaptchaDetected
+                by_page[futures[future]] = _extract_page(future.result(), all_results, skip_tokens)
+        for page in sorted(by_page):
+            for token, info in by_page[page].items():
+                all_results.setdefault(token, info)
+
+    log.info("Found %d private listings across %d page(s)", len(all_results), pages_to_fetch)
+    return [info for info in all_results.values() if info is not None]
 
 
 def _prune_found() -> None:
     """Remove entries older than SEEN_TTL_DAYS from the found store."""
-    cutoff = (datetime.now(timezone.utc) - timedelta(days=config.SEEN_TTL_DAYS)).strftime("%Y-%m-%d %H:%M:%S")
+    # found_at is local wall-clock time in a fixed-width format, so the cutoff
+    # is formatted the same way and entries are compared as plain strings.
+    cutoff = time.strftime(_FOUND_AT_FORMAT, time.localtime(time.time() - config.SEEN_TTL_DAYS * 86400))
     with _found_lock:
         before = len(_found_listings)
         _found_listings[:] = [
@@ -343,8 +669,11 @@ def _prune_found() -> None:
         ]
         removed = before - len(_found_listings)
         if removed > 0:
-            _save_found()
+            _rebuild_token_index()
+            write = _plan_rewrite()
+            _found_io_lock.acquire()
     if removed > 0:
+        _flush_found(write)
         log.info("Pruned %d old entries from found listings (older than %d days)", removed, config.SEEN_TTL_DAYS)
 
 
@@ -372,7 +701,40 @@ def format_listing_text(info: dict) -> str:
     )
 
 
+# Long-lived SMTP connection, opened lazily and reused across notifications.
+_smtp: smtplib.SMTP_SSL | None = None
+_smtp_lock = threading.Lock()
+
+
+def _smtp_connect() -> smtplib.SMTP_SSL:
+    server = smtplib.SMTP_SSL("smtp.gmail.com", 465, timeout=30)
+    try:
+        server.login(config.GMAIL_ADDRESS, config.GMAIL_APP_PASSWORD)
+    except BaseException:
+        server.close()
+        raise
+    return server
+
+
+def _smtp_discard() -> None:
+    """Drop the cached connection. Caller must hold _smtp_lock."""
+    global _smtp
+    if _smtp is None:
+        return
+    try:
+        _smtp.quit()
+    except (smtplib.SMTPException, OSError):
+        pass
+    _smtp = None
+
+
+def close_smtp() -> None:
+    with _smtp_lock:
+        _smtp_discard()
+
+
 def send_email(new_listings: list[dict]) -> bool:
+    global _smtp
     if not config.GMAIL_ADDRESS or not config.GMAIL_APP_PASSWORD or not config.NOTIFY_EMAIL:
         log.error("Missing email credentials in .env — cannot send notification")
         return False
@@ -387,59 +749,94 @@ def send_email(new_listings: list[dict]) -> bool:
     body = "\n".join(body_parts)
     body += f"\n\nקישור לחיפוש המלא:\n{build_url()}\n"
 
-    msg = MIMEMultipart("alternative")
+    msg = EmailMessage()
     msg["Subject"] = subject
     msg["From"] = config.GMAIL_ADDRESS
     msg["To"] = config.NOTIFY_EMAIL
-    msg.attach(MIMEText(body, "plain", "utf-8"))
+    msg.set_content(body)
 
-    try:
-        with smtplib.SMTP_SSL("smtp.gmail.com", 465, timeout=30) as server:
-            server.login(config.GMAIL_ADDRESS, config.GMAIL_APP_PASSWORD)
-            server.sendmail(config.GMAIL_ADDRESS, config.NOTIFY_EMAIL, msg.as_string())
-        log.info("Email sent successfully to %s", config.NOTIFY_EMAIL)
-        return True
-    except smtplib.SMTPException as exc:
-        log.error("Failed to send email: %s", exc)
-        return False
+    with _smtp_lock:
+        try:
+            if _smtp is None:
+                _smtp = _smtp_connect()
+            try:
+                _smtp.send_message(msg)
+            except OSError:
+                # Gmail drops idle connections; a stale socket surfaces as
+                # SMTPServerDisconnected or a broken pipe / reset. Reconnect
+                # once and retry.
+                _smtp_discard()
+                _smtp = _smtp_connect()
+                _smtp.send_message(msg)
+        except (smtplib.SMTPException, OSError) as exc:
+            log.error("Failed to send email: %s", exc)
+            _smtp_discard()
+            return False
+    log.info("Email sent successfully to %s", config.NOTIFY_EMAIL)
+    return True
 
 
 # ---------------------------------------------------------------------------
 # Telegram notification (Phase 5b)
 # ---------------------------------------------------------------------------
 
+_telegram_session = requests.Session()
+_TELEGRAM_MAX_CHARS = 4096
+
+
+def _chunk_blocks(blocks: list[str], sep: str, limit: int) -> list[str]:
+    """Joins blocks with sep into as few messages as fit within limit chars."""
+    chunks: list[str] = []
+    current: list[str] = []
+    size = 0
+    for block in blocks:
+        added = len(block) + (len(sep) if current else 0)
+        if current and size + added > limit:
+            chunks.append(sep.join(current))
+            current, size, added = [], 0, len(block)
+        current.append(block)
+        size += added
+    if current:
+        chunks.append(sep.join(current))
+    return chunks
+
+
 def send_telegram(new_listings: list[dict]) -> bool:
     token = config.TELEGRAM_BOT_TOKEN
     chat_id = config.TELEGRAM_CHAT_ID
     if not token or not chat_id:
         return False
 
-    lines = []
+    blocks = []
     for lst in new_listings:
         price = lst["price"]
         price_s = f"{price:,}₪" if isinstance(price, (int, float)) and price else "?"
         km = lst.get("km")
         km_s = f"{km:,} ק\"מ" if isinstance(km, (int, float)) and km else "לא צוין"
-        lines.append(
-            f"🚗 {lst['manufacturer']} {lst['model']}\n"
-            f"💰 {price_s} | {lst['year']} | {lst['hand']}\n"
+        blocks.append(
+            f"🚗 <b>{escape(str(lst['manufacturer']))} {escape(str(lst['model']))}</b>\n"
+            f"💰 {price_s} | {escape(str(lst['year']))} | {escape(str(lst['hand']))}\n"
             f"🛣 {km_s}\n"
-            f"📍 {lst['area']}\n"
-            f"🔗 {lst['link']}"
+            f"📍 {escape(str(lst['area']))}\n"
+            f"🔗 {escape(lst['link'])}"
         )
-    text = "\n\n".join(lines)
 
     url = f"https://api.telegram.org/bot{token}/sendMessage"
-    try:
-        resp = requests.post(url, json={"chat_id": chat_id, "text": text}, timeout=10)
+    ok = True
+    for text in _chunk_blocks(blocks, "\n\n", _TELEGRAM_MAX_CHARS):
+        try:
+            resp = _telegram_session.post(
+                url, json={"chat_id": chat_id, "text": text, "parse_mode": "HTML"}, timeout=10
+            )
+        except requests.RequestException as exc:
+            log.error("Failed to send Telegram message: %s", exc)
+            return False
         if resp.ok:
             log.info("Telegram message sent successfully")
         else:
             log.warning("Telegram API returned %d: %s", resp.status_code, resp.text[:200])
-        return resp.ok
-    except requests.RequestException as exc:
-        log.error("Failed to send Telegram message: %s", exc)
-        return False
+            ok = False
+    return ok
 
 
 # ---------------------------------------------------------------------------
@@ -447,40 +844,27 @@ def send_telegram(new_listings: list[dict]) -> bool:
 # ---------------------------------------------------------------------------
 
 def check_once(session: requests.Session) -> None:
-    listings = fetch_listings(session)  # raises CaptchaDetected on CAPTCHA
-    if not listings:
-        return
-
-    seen_tokens = _get_seen_tokens()
-    new_listings = [lst for lst in listings if lst["token"] not in seen_tokens]
+    # Membership tests on _found_by_token are safe without _found_lock, and only
+    # this thread adds tokens, so nothing returned here can already be stored.
+    new_listings = fetch_listings(session, skip_tokens=_found_by_token)  # raises CaptchaDetected
 
     if not new_listings:
         log.info("No new listings found")
         return
 
-    log.info("Found %d new listing(s)!", len(new_listings))
+    _increment_state(found_total=len(new_listings))
 
-    _update_state(found_total=get_state()["found_total"] + len(new_listings))
-
-    stamped = []
-    for lst in new_listings:
-        entry = dict(lst)
-        entry["found_at"] = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-        stamped.append(entry)
+    found_at = time.strftime(_FOUND_AT_FORMAT)
+    stamped = [{**lst, "found_at": found_at} for lst in new_listings]
     _append_found(stamped)
 
-    for lst in new_listings:
-        log.info(
-            "New listing: token=%s | %s %s | price=%s | year=%s | km=%s | %s | %s",
-            lst["token"],
-            lst["manufacturer"],
-            lst["model"],
-            lst["price"],
-            lst["year"],
-            lst["km"],
-            lst["hand"],
-            lst["area"],
-        )
+    # One record for the whole batch: a single lock/format/write per handler.
+    details = "\n".join(
+        f"New listing: token={lst['token']} | {lst['manufacturer']} {lst['model']} | "
+        f"price={lst['price']} | year={lst['year']} | km={lst['km']} | {lst['hand']} | {lst['area']}"
+        for lst in new_listings
+    )
+    log.info("Found %d new listing(s)!\n%s", len(new_listings), details)
 
     send_telegram(new_listings)
 
@@ -497,19 +881,16 @@ def run_loop() -> None:
     log.info("=" * 60)
 
     session = create_session()
+    _warm_session(session)
 
     captcha_backoff = 0
 
     while not shutdown_event.is_set():
+        checked = False
         try:
             check_once(session)
             captcha_backoff = 0
-            _update_state(
-                last_check_at=datetime.now(timezone.utc).isoformat(),
-                checks_count=get_state()["checks_count"] + 1,
-                captcha_active=False,
-                captcha_backoff_until=None,
-            )
+            checked = True
         except CaptchaDetected:
             if captcha_backoff == 0:
                 captcha_backoff = config.CHECK_INTERVAL_SECONDS
@@ -522,26 +903,39 @@ def run_loop() -> None:
             _update_state(captcha_active=True, captcha_backoff_until=backoff_until)
             log.warning("CAPTCHA detected — backing off for %d seconds", captcha_backoff)
             session = create_session()
-            shutdown_event.wait(captcha_backoff)
+            _idle(session, captcha_backoff)
             _update_state(captcha_active=False, captcha_backoff_until=None)
             continue
         except Exception:
             log.exception("Unexpected error during check cycle")
 
         interval = config.CHECK_INTERVAL_SECONDS
-        next_at = (datetime.now(timezone.utc) + timedelta(seconds=interval)).isoformat()
-        _update_state(next_check_at=next_at)
+        now = datetime.now(timezone.utc)
+        next_at = (now + timedelta(seconds=interval)).isoformat()
+        if checked:
+            _increment_state(checks_count=1)
+            _update_state(
+                last_check_at=now.isoformat(),
+                next_check_at=next_at,
+                captcha_active=False,
+                captcha_backoff_until=None,
+            )
+        else:
+            _update_state(next_check_at=next_at)
         log.info("Waiting %d seconds until next check...", interval)
-        shutdown_event.wait(interval)
+        _idle(session, interval)
 
     _update_state(next_check_at=None)
+    close_smtp()
     log.info("Monitor stopped.")
 
 
+_SIG_NAMES = {int(sig): sig.name for sig in signal.Signals}
+
+
 def main() -> None:
     def _handle_signal(signum, _frame):
-        sig_name = signal.Signals(signum).name
-        log.info("Received %s — shutting down gracefully...", sig_name)
+        log.info("Received %s — shutting down gracefully...", _SIG_NAMES.get(signum, signum))
         shutdown_event.set()
 
     signal.signal(signal.SIGINT, _handle_signal)